@@ -0,0 +1,37 @@
+"""Added car search indexes
+
+Revision ID: 8d2e6b0f5a17
+Revises: 3f9a1c2e7b44
+Create Date: 2026-10-19 11:04:27.902551
+
+"""
+from typing import Sequence, Union
+
+import sqlmodel
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8d2e6b0f5a17'
+down_revision: Union[str, None] = '3f9a1c2e7b44'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('car', sa.Column('normalizedPlate', sqlmodel.sql.sqltypes.AutoString(), nullable=True))
+    # Same normalization as backend.models.normalize_plate
+    op.execute("UPDATE car SET normalizedPlate = UPPER(REGEXP_REPLACE(licensePlate, '[^[:alnum:]]', ''))")
+    op.create_index(op.f('ix_car_normalizedPlate'), 'car', ['normalizedPlate'], unique=False)
+    op.create_index(op.f('ix_car_productionYear'), 'car', ['productionYear'], unique=False)
+    op.create_index('ix_car_make_model', 'car', ['make', 'model'], unique=False, mysql_length={'make': 32, 'model': 32})
+    op.create_index('ix_car_make_model_fulltext', 'car', ['make', 'model'], unique=False, mysql_prefix='FULLTEXT')
+
+
+def downgrade() -> None:
+    op.drop_index('ix_car_make_model_fulltext', table_name='car')
+    op.drop_index('ix_car_make_model', table_name='car')
+    op.drop_index(op.f('ix_car_productionYear'), table_name='car')
+    op.drop_index(op.f('ix_car_normalizedPlate'), table_name='car')
+    op.drop_column('car', 'normalizedPlate')
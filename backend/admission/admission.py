@@ -0,0 +1,166 @@
+import asyncio
+import math
+import re
+import time
+
+from collections import deque
+from typing import Dict, Optional
+
+from fastapi import APIRouter
+from starlette.responses import JSONResponse
+
+from backend.dtos import AdmissionStatsDTO
+
+# Weight of the newest request in the moving average of service times
+SERVICE_TIME_SMOOTHING = 0.2
+
+router = APIRouter()
+
+
+class RouteClass:
+    """Concurrency limit with a bounded FIFO wait queue for one class of routes."""
+
+    def __init__(self, name: str, limit: int, max_queue: int, max_wait: float):
+        self.name = name
+        self.limit = limit
+        self.max_queue = max_queue
+        self.max_wait = max_wait
+        self.active = 0
+        self.admitted = 0
+        self.shed = 0
+        self.avg_service_time = 0.0
+        self.waiters = deque()
+
+    def estimated_wait(self) -> float:
+        # Time until a request joining the back of the queue would get a slot
+        return (len(self.waiters) + 1) / self.limit * self.avg_service_time
+
+    async def acquire(self) -> bool:
+        if self.active < self.limit and not self.waiters:
+            self.active += 1
+            self.admitted += 1
+            return True
+
+        # Shed right away when the queue is full or the wait would overrun the deadline anyway
+        if len(self.waiters) >= self.max_queue or self.estimated_wait() > self.max_wait:
+            self.shed += 1
+            return False
+
+        waiter = asyncio.get_running_loop().create_future()
+        self.waiters.append(waiter)
+        try:
+            await asyncio.wait_for(waiter, self.max_wait)
+        except asyncio.TimeoutError:
+            self._forget(waiter)
+            # release() may have handed us the slot just as the deadline fired; keep it rather than leak it
+            if not (waiter.done() and not waiter.cancelled()):
+                self.shed += 1
+                return False
+        except asyncio.CancelledError:
+            # The client went away; hand on a slot that was already passed to us
+            self._forget(waiter)
+            if waiter.done() and not waiter.cancelled():
+                self.release(None)
+            raise
+
+        self.admitted += 1
+        return True
+
+    def release(self, service_time: Optional[float]):
+        if service_time is not None:
+            self.avg_service_time += SERVICE_TIME_SMOOTHING * (service_time - self.avg_service_time)
+
+        # The slot passes straight to the oldest waiter, so active stays the same
+        while self.waiters:
+            waiter = self.waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self.active -= 1
+
+    def retry_after(self) -> int:
+        return max(1, math.ceil(self.estimated_wait()))
+
+    def _forget(self, waiter):
+        try:
+            self.waiters.remove(waiter)
+        except ValueError:
+            pass
+
+
+# Limits plus the report job threads (REPORT_WORKERS = 4) add up to the size of the default
+# SQLAlchemy pool (5 connections + 10 overflow), since those threads draw from the same engine
+ROUTE_CLASSES: Dict[str, RouteClass] = {
+    "reports": RouteClass("reports", limit=2, max_queue=4, max_wait=10.0),
+    "lists": RouteClass("lists", limit=3, max_queue=16, max_wait=2.0),
+    "point_reads": RouteClass("point_reads", limit=4, max_queue=32, max_wait=1.0),
+    "writes": RouteClass("writes", limit=2, max_queue=16, max_wait=3.0),
+}
+
+REPORT_PATH = re.compile(r"Report|^/analytics/")
+POINT_READ_PATH = re.compile(r"^/(cars|garages|maintenance|schedules)/\d+/?$|^/reports/jobs/[^/]+(/result)?/?$")
+LIST_PATH = re.compile(r"^/(cars|garages|maintenance|schedules)(/search)?/?$")
+WRITE_PATH = re.compile(r"^/(cars|garages|maintenance|schedules|reports|archive|batch)(/|$)")
+
+
+def classify(method: str, path: str) -> Optional[str]:
+    # Routes outside the API (docs, admission stats) are never queued
+    if REPORT_PATH.search(path):
+        return "reports"
+    if method in ("GET", "HEAD"):
+        if POINT_READ_PATH.match(path):
+            return "point_reads"
+        if LIST_PATH.match(path):
+            return "lists"
+        return None
+    if method != "OPTIONS" and WRITE_PATH.match(path):
+        return "writes"
+    return None
+
+
+class AdmissionControlMiddleware:
+    def __init__(self, app, route_classes: Dict[str, RouteClass] = None):
+        self.app = app
+        self.route_classes = route_classes if route_classes is not None else ROUTE_CLASSES
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        route_class = self.route_classes.get(classify(scope["method"], scope["path"]))
+        if route_class is None:
+            await self.app(scope, receive, send)
+            return
+
+        if not await route_class.acquire():
+            response = JSONResponse(
+                status_code=503,
+                content={"detail": "Server is busy, please retry later"},
+                headers={"Retry-After": str(route_class.retry_after())},
+            )
+            await response(scope, receive, send)
+            return
+
+        started = time.monotonic()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            route_class.release(time.monotonic() - started)
+
+
+# GET /admission/stats
+@router.get("/admission/stats", response_model=Dict[str, AdmissionStatsDTO], tags=["Admission Controller"])
+def get_admission_stats():
+    return {
+        name: AdmissionStatsDTO(
+            limit=route_class.limit,
+            active=route_class.active,
+            queued=len(route_class.waiters),
+            maxQueue=route_class.max_queue,
+            admitted=route_class.admitted,
+            shed=route_class.shed,
+            avgServiceTime=route_class.avg_service_time,
+        )
+        for name, route_class in ROUTE_CLASSES.items()
+    }
@@ -0,0 +1,139 @@
+import numpy as np
+
+from fastapi import APIRouter, HTTPException, Depends, Query
+from sqlalchemy.orm import Session
+from typing import Dict, List, Tuple
+from datetime import datetime, timedelta
+
+from backend.models import Garage
+from backend.dtos import GarageUtilizationDTO, CityUtilizationDTO, UtilizationReportDTO
+from backend.database import get_db
+from backend.report.queries import count_requests_by_day, count_requests_by_service_type
+
+MAX_ANALYTICS_DAYS = 5 * 366
+
+router = APIRouter()
+
+
+def _occupancy(booked: np.ndarray, capacity: np.ndarray) -> np.ndarray:
+    # Garages without capacity count as unoccupied instead of dividing by zero
+    return np.divide(booked, capacity, out=np.zeros(booked.shape), where=capacity > 0)
+
+
+def _matrix(counts: Dict[Tuple[int, object], int], rows: Dict[int, int], columns, shape) -> np.ndarray:
+    matrix = np.zeros(shape, dtype=np.int64)
+    if counts:
+        keys = list(counts)
+        matrix[
+            np.fromiter((rows[garage_id] for garage_id, _ in keys), dtype=np.intp, count=len(keys)),
+            np.fromiter((columns(column) for _, column in keys), dtype=np.intp, count=len(keys)),
+        ] = np.fromiter(counts.values(), dtype=np.int64, count=len(keys))
+    return matrix
+
+
+def _service_types(mix_row: np.ndarray, service_types: List[str]) -> Dict[str, int]:
+    return {service_types[i]: int(mix_row[i]) for i in np.flatnonzero(mix_row)}
+
+
+# GET /analytics/utilization
+@router.get("/analytics/utilization", response_model=UtilizationReportDTO, tags=["Analytics Controller"])
+def get_utilization(
+        start_date: str,
+        end_date: str,
+        city: str = None,
+        garage_ids: List[int] = Query(None),
+        db: Session = Depends(get_db)
+):
+    try:
+        start = datetime.strptime(start_date, "%Y-%m-%d").date()
+        end = datetime.strptime(end_date, "%Y-%m-%d").date()
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid date format. Expected YYYY-MM-DD.")
+
+    num_days = (end - start).days + 1
+    if num_days < 1:
+        raise HTTPException(status_code=400, detail="Start date must not be after end date.")
+    if num_days > MAX_ANALYTICS_DAYS:
+        raise HTTPException(status_code=400, detail=f"The window can span at most {MAX_ANALYTICS_DAYS} days.")
+
+    query = db.query(Garage)
+    if city:
+        query = query.filter(Garage.city == city)
+    if garage_ids:
+        query = query.filter(Garage.id.in_(garage_ids))
+    garages = query.order_by(Garage.id).all()
+
+    if not garages:
+        raise HTTPException(status_code=404, detail="No garages found")
+
+    rows = {garage.id: i for i, garage in enumerate(garages)}
+
+    # Two grouped queries fill a garage x day matrix and a garage x service type matrix
+    day_counts = count_requests_by_day(db, rows, start, end)
+    type_counts = count_requests_by_service_type(db, rows, start, end)
+
+    service_types = sorted({service_type for _, service_type in type_counts})
+    type_columns = {service_type: i for i, service_type in enumerate(service_types)}
+
+    booked = _matrix(day_counts, rows, lambda day: (day - start).days, (len(garages), num_days))
+    mix = _matrix(type_counts, rows, type_columns.__getitem__, (len(garages), len(service_types)))
+    capacity = np.array([garage.capacity for garage in garages], dtype=np.float64)
+
+    occupancy = _occupancy(booked, capacity[:, None])
+    garage_peaks = occupancy.argmax(axis=1)
+    garage_peak_occupancy = occupancy[np.arange(len(garages)), garage_peaks]
+    garage_requests = booked.sum(axis=1)
+    garage_average = occupancy.mean(axis=1)
+    overbooked_days = (booked > capacity[:, None]).sum(axis=1)
+
+    cities, city_rows = np.unique([garage.city for garage in garages], return_inverse=True)
+    city_booked = np.zeros((len(cities), num_days), dtype=np.int64)
+    np.add.at(city_booked, city_rows, booked)
+    city_mix = np.zeros((len(cities), len(service_types)), dtype=np.int64)
+    np.add.at(city_mix, city_rows, mix)
+    city_capacity = np.bincount(city_rows, weights=capacity, minlength=len(cities))
+    city_garages = np.bincount(city_rows, minlength=len(cities))
+
+    city_occupancy = _occupancy(city_booked, city_capacity[:, None])
+    city_peaks = city_occupancy.argmax(axis=1)
+
+    fleet_occupancy = _occupancy(booked.sum(axis=0), capacity.sum())
+    fleet_peak = int(fleet_occupancy.argmax())
+
+    return UtilizationReportDTO(
+        startDate=start,
+        endDate=end,
+        garages=[
+            GarageUtilizationDTO(
+                garage_id=garage.id,
+                garageName=garage.name,
+                city=garage.city,
+                capacity=garage.capacity,
+                requests=int(garage_requests[i]),
+                averageOccupancy=float(garage_average[i]),
+                peakDate=start + timedelta(days=int(garage_peaks[i])),
+                peakOccupancy=float(garage_peak_occupancy[i]),
+                overbookedDays=int(overbooked_days[i]),
+                serviceTypes=_service_types(mix[i], service_types),
+            )
+            for i, garage in enumerate(garages)
+        ],
+        cities=[
+            CityUtilizationDTO(
+                city=str(city_name),
+                garages=int(city_garages[i]),
+                capacity=int(city_capacity[i]),
+                requests=int(city_booked[i].sum()),
+                averageOccupancy=float(city_occupancy[i].mean()),
+                peakDate=start + timedelta(days=int(city_peaks[i])),
+                peakOccupancy=float(city_occupancy[i, city_peaks[i]]),
+                serviceTypes=_service_types(city_mix[i], service_types),
+            )
+            for i, city_name in enumerate(cities)
+        ],
+        requests=int(booked.sum()),
+        averageOccupancy=float(fleet_occupancy.mean()),
+        peakDate=start + timedelta(days=fleet_peak),
+        peakOccupancy=float(fleet_occupancy[fleet_peak]),
+        serviceTypes=_service_types(mix.sum(axis=0), service_types),
+    )
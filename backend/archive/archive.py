@@ -0,0 +1,107 @@
+from fastapi import APIRouter, HTTPException, Depends
+from sqlalchemy.orm import Session
+from typing import Optional
+from datetime import date, datetime, timedelta
+
+from backend.models import MaintenanceRequest, MaintenanceRequestArchive, ArchiveState
+from backend.dtos import ArchiveRunDTO
+from backend.database import get_db, engine
+
+# Maintenance requests scheduled more than this many days ago are moved to the archive table
+ARCHIVE_AFTER_DAYS = 365
+ARCHIVE_BATCH_SIZE = 1000
+
+router = APIRouter()
+
+
+def get_archive_cutoff(db: Session) -> Optional[date]:
+    # Every row scheduled before this date may live in the archive table
+    state = db.get(ArchiveState, 1)
+    return state.archivedBefore if state else None
+
+
+def reaches_archive(db: Session, start_date: Optional[date]) -> bool:
+    cutoff = get_archive_cutoff(db)
+    if cutoff is None:
+        return False
+    return start_date is None or start_date < cutoff
+
+
+def archive_maintenance_requests(db: Session, cutoff_date: date, batch_size: int = ARCHIVE_BATCH_SIZE) -> int:
+    # Raise the watermark first, so readers look in the archive even if the run is interrupted
+    state = db.get(ArchiveState, 1)
+    if state is None:
+        state = ArchiveState(id=1, archivedBefore=cutoff_date)
+    elif state.archivedBefore < cutoff_date:
+        state.archivedBefore = cutoff_date
+    db.add(state)
+    db.commit()
+
+    archived = 0
+    while True:
+        # Each batch is copied and deleted in one transaction, so a rerun resumes where it stopped;
+        # rows locked by a concurrent run are skipped, so two runs never move the same row
+        batch = (
+            db.query(MaintenanceRequest)
+            .filter(MaintenanceRequest.scheduledDate < cutoff_date)
+            .order_by(MaintenanceRequest.id)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+            .all()
+        )
+        if not batch:
+            break
+
+        db.add_all([
+            MaintenanceRequestArchive(
+                id=maintenance.id,
+                car_id=maintenance.car_id,
+                garage_id=maintenance.garage_id,
+                serviceType=maintenance.serviceType,
+                scheduledDate=maintenance.scheduledDate,
+                schedule_id=maintenance.schedule_id,
+                occurrenceDate=maintenance.occurrenceDate,
+            )
+            for maintenance in batch
+        ])
+        db.query(MaintenanceRequest).filter(
+            MaintenanceRequest.id.in_([maintenance.id for maintenance in batch])
+        ).delete(synchronize_session=False)
+        db.commit()
+        db.expunge_all()
+
+        archived += len(batch)
+
+    return archived
+
+
+# POST /archive/maintenance
+@router.post("/archive/maintenance", response_model=ArchiveRunDTO, tags=["Archive Controller"])
+def run_maintenance_archive(
+        cutoff_date: str = None,
+        batch_size: int = ARCHIVE_BATCH_SIZE,
+        db: Session = Depends(get_db)
+):
+    if cutoff_date:
+        try:
+            cutoff = datetime.strptime(cutoff_date, "%Y-%m-%d").date()
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid date format. Expected YYYY-MM-DD.")
+        if cutoff > date.today():
+            raise HTTPException(status_code=400, detail="Cutoff date must not be in the future.")
+    else:
+        cutoff = date.today() - timedelta(days=ARCHIVE_AFTER_DAYS)
+
+    if batch_size < 1:
+        raise HTTPException(status_code=400, detail="Batch size must be positive.")
+
+    archived = archive_maintenance_requests(db, cutoff, batch_size)
+
+    return ArchiveRunDTO(cutoffDate=cutoff, archived=archived)
+
+
+if __name__ == "__main__":
+    with Session(engine) as session:
+        cutoff = date.today() - timedelta(days=ARCHIVE_AFTER_DAYS)
+        print(f"Archiving maintenance requests scheduled before {cutoff}...")
+        print(f"Archived {archive_maintenance_requests(session, cutoff)} maintenance requests.")
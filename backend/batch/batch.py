@@ -0,0 +1,166 @@
+import inspect
+import json
+import logging
+
+from fastapi import APIRouter, HTTPException, Depends
+from fastapi.encoders import jsonable_encoder
+from fastapi.params import Depends as DependsParam
+from fastapi.routing import APIRoute
+from pydantic import BaseModel, TypeAdapter, ValidationError, create_model
+from sqlmodel import Session
+from starlette.responses import Response
+from starlette.routing import Match
+from typing import Callable, Dict, List, Tuple
+from urllib.parse import parse_qsl, urlsplit
+
+from backend.admission.admission import REPORT_PATH
+from backend.dtos import BatchRequestDTO, BatchResponseDTO, BatchOperationDTO, BatchOperationResultDTO
+from backend.database import get_db
+from backend.report.report import bump_data_version
+from backend.garage.garage import router as garage_router
+from backend.car.car import router as car_router
+from backend.maintenance.maintenance import router as maintenance_router
+
+MAX_BATCH_OPERATIONS = 25
+
+# Operations left unexecuted after an atomic batch failed
+NOT_EXECUTED_STATUS = 424
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+BATCH_ROUTES: List[APIRoute] = [
+    route for route in garage_router.routes + car_router.routes + maintenance_router.routes
+    if isinstance(route, APIRoute)
+]
+
+# Keyed by endpoint function, since routes are not hashable
+_params_models: Dict[Callable, type] = {}
+_response_adapters: Dict[Callable, TypeAdapter] = {}
+
+
+def _resolve(operation: BatchOperationDTO) -> Tuple[APIRoute, dict]:
+    scope = {"type": "http", "method": operation.method.upper(), "path": urlsplit(operation.path).path}
+    # Reports would bypass the reports admission class from inside a batch
+    if REPORT_PATH.search(scope["path"]):
+        raise HTTPException(status_code=400, detail="Reports are not supported in a batch, use POST /reports/jobs")
+    method_not_allowed = False
+    for route in BATCH_ROUTES:
+        match, child_scope = route.matches(scope)
+        if match == Match.FULL:
+            return route, child_scope["path_params"]
+        if match == Match.PARTIAL:
+            method_not_allowed = True
+
+    if method_not_allowed:
+        raise HTTPException(status_code=405, detail="Method Not Allowed")
+    raise HTTPException(status_code=404, detail="Not Found")
+
+
+def _params_model(route: APIRoute) -> type:
+    # Path and query parameters of the endpoint as a pydantic model, keeping Query(...) constraints
+    if route.endpoint not in _params_models:
+        fields = {}
+        for name, param in inspect.signature(route.endpoint).parameters.items():
+            if isinstance(param.default, DependsParam) or _is_body(param):
+                continue
+            default = ... if param.default is inspect.Parameter.empty else param.default
+            fields[name] = (param.annotation, default)
+        _params_models[route.endpoint] = create_model(f"{route.endpoint.__name__}_params", **fields)
+    return _params_models[route.endpoint]
+
+
+def _is_body(param: inspect.Parameter) -> bool:
+    return inspect.isclass(param.annotation) and issubclass(param.annotation, BaseModel)
+
+
+def _call(db: Session, operation: BatchOperationDTO) -> BatchOperationResultDTO:
+    route, path_params = _resolve(operation)
+
+    query = dict(parse_qsl(urlsplit(operation.path).query))
+    query.update(operation.query)
+    params = _params_model(route).model_validate({**query, **path_params})
+
+    kwargs = dict(params)
+    for name, param in inspect.signature(route.endpoint).parameters.items():
+        if isinstance(param.default, DependsParam):
+            if param.default.dependency is not get_db:
+                raise HTTPException(status_code=400, detail=f"{operation.path} is not supported in a batch")
+            kwargs[name] = db
+        elif _is_body(param):
+            kwargs[name] = param.annotation.model_validate(operation.body)
+
+    result = route.endpoint(**kwargs)
+
+    if isinstance(result, Response):
+        return BatchOperationResultDTO(status=result.status_code, body=json.loads(result.body))
+
+    if route.response_model is None:
+        return BatchOperationResultDTO(status=route.status_code or 200, body=jsonable_encoder(result))
+
+    if route.endpoint not in _response_adapters:
+        _response_adapters[route.endpoint] = TypeAdapter(route.response_model)
+    adapter = _response_adapters[route.endpoint]
+    body = adapter.dump_python(adapter.validate_python(result, from_attributes=True), mode="json")
+    return BatchOperationResultDTO(status=route.status_code or 200, body=body)
+
+
+def _run_operations(db: Session, operations: List[BatchOperationDTO], stop_on_error: bool):
+    results = []
+    for operation in operations:
+        try:
+            results.append(_call(db, operation))
+            continue
+        except HTTPException as e:
+            results.append(BatchOperationResultDTO(status=e.status_code, body={"detail": e.detail}))
+        except ValidationError as e:
+            results.append(BatchOperationResultDTO(
+                status=422, body={"detail": jsonable_encoder(e.errors(include_url=False, include_context=False))}
+            ))
+        except Exception:
+            # An unexpected failure only fails its own operation; in atomic mode it rolls back the batch
+            logger.exception("Batch operation %s %s failed", operation.method, operation.path)
+            results.append(BatchOperationResultDTO(status=500, body={"detail": "Internal Server Error"}))
+
+        db.rollback()
+        if stop_on_error:
+            break
+
+    for _ in operations[len(results):]:
+        results.append(BatchOperationResultDTO(status=NOT_EXECUTED_STATUS, body={"detail": "Not executed"}))
+
+    return results
+
+
+# POST /batch
+@router.post("/batch", response_model=BatchResponseDTO, tags=["Batch Controller"])
+def run_batch(batch: BatchRequestDTO, db: Session = Depends(get_db)):
+    if len(batch.operations) > MAX_BATCH_OPERATIONS:
+        raise HTTPException(status_code=400, detail=f"A batch can hold at most {MAX_BATCH_OPERATIONS} operations")
+
+    if not batch.atomic:
+        # Every operation commits on its own, but they all share this request's session
+        results = _run_operations(db, batch.operations, stop_on_error=False)
+        return BatchResponseDTO(committed=True, results=results)
+
+    # The endpoints' own commits only release savepoints inside this outer transaction
+    with db.get_bind().connect() as connection:
+        transaction = connection.begin()
+        with Session(bind=connection, join_transaction_mode="create_savepoint") as batch_db:
+            try:
+                results = _run_operations(batch_db, batch.operations, stop_on_error=True)
+            except Exception:
+                transaction.rollback()
+                raise
+
+            committed = all(result.status < 400 for result in results)
+            if committed:
+                # The report data version is bumped once here, not by every operation's commit
+                bump_data_version(batch_db)
+                batch_db.commit()
+                transaction.commit()
+            else:
+                transaction.rollback()
+
+    return BatchResponseDTO(committed=committed, results=results)
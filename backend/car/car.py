@@ -1,20 +1,54 @@
-from fastapi import APIRouter, HTTPException, Depends
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, HTTPException, Depends, Query
+from sqlalchemy.orm import Session, load_only, selectinload
 from typing import List
 from datetime import datetime, timedelta
 
 from backend.garage import garage
-from backend.models import Car, Garage, CarGarage, MaintenanceRequest
+from backend.models import Car, Garage, CarGarage, MaintenanceRequest, MaintenanceRequestArchive, MaintenanceSchedule
 from backend.dtos import (
     CreateCarDTO,
     UpdateCarDTO,
     ResponseCarDTO,
     DailyAvailabilityReportDTO, ResponseGarageDTO,
+    CarSearchResultDTO, CarSearchPageDTO,
 )
 from backend.database import get_db
+from backend.car.search import search_cars
+from backend.fieldsets import parse_fields, sparse_response
 
 router = APIRouter()
 
+CAR_FIELDS = ("id", "make", "model", "productionYear", "licensePlate", "garages")
+
+# GET /cars/search (registered before /cars/{id} so "search" is not parsed as an id)
+@router.get("/cars/search", response_model=CarSearchPageDTO, tags=["Car Controller"])
+def search_cars_endpoint(
+        q: str = None,
+        make: str = None,
+        model: str = None,
+        from_year: int = None,
+        to_year: int = None,
+        limit: int = Query(20, ge=1, le=100),
+        cursor: str = None,
+        db: Session = Depends(get_db)
+):
+    rows, next_cursor = search_cars(db, q, make, model, from_year, to_year, limit, cursor)
+
+    items = [
+        CarSearchResultDTO(
+            id=car.id,
+            make=car.make,
+            model=car.model,
+            productionYear=car.productionYear,
+            licensePlate=car.licensePlate,
+            rank=rank,
+        )
+        for car, rank in rows
+    ]
+
+    return CarSearchPageDTO(items=items, nextCursor=next_cursor)
+
+
 # GET /cars/{id}
 @router.get("/cars/{id}", response_model=ResponseCarDTO, tags=["Car Controller"])
 def get_car_by_id(id: int, db: Session = Depends(get_db)):
@@ -73,6 +107,8 @@ def delete_car(id: int, db: Session = Depends(get_db)):
 
     db.query(CarGarage).filter(CarGarage.car_id == id).delete()
     db.query(MaintenanceRequest).filter(MaintenanceRequest.car_id == id).delete()
+    db.query(MaintenanceRequestArchive).filter(MaintenanceRequestArchive.car_id == id).delete()
+    db.query(MaintenanceSchedule).filter(MaintenanceSchedule.car_id == id).delete()
 
     car_dto = ResponseCarDTO.from_orm(car)
 
@@ -88,10 +124,19 @@ def get_cars(
         garage_id: int = None,
         from_year: int = None,
         to_year: int = None,
+        fields: str = None,
         db: Session = Depends(get_db)
 ):
+    selected = parse_fields(fields, CAR_FIELDS)
+
     query = db.query(Car)
 
+    if selected:
+        columns = [getattr(Car, field) for field in selected if field != "garages"]
+        query = query.options(load_only(Car.id, *columns))
+        if "garages" in selected:
+            query = query.options(selectinload(Car.garages))
+
     if car_make:
         query = query.filter(Car.make == car_make)
 
@@ -99,16 +144,26 @@ def get_cars(
         query = query.join(Car.garages).filter(Garage.id == garage_id)
 
     if from_year:
-        query = query.filter(Car.production_year >= from_year)
+        query = query.filter(Car.productionYear >= from_year)
 
     if to_year:
-        query = query.filter(Car.production_year <= to_year)
+        query = query.filter(Car.productionYear <= to_year)
 
     cars = query.all()
 
     if not cars:
         raise HTTPException(status_code=404, detail="No cars found")
 
+    if selected:
+        return sparse_response([
+            {
+                field: [ResponseGarageDTO.from_orm(garage).dict() for garage in car.garages]
+                if field == "garages" else getattr(car, field)
+                for field in selected
+            }
+            for car in cars
+        ])
+
     return cars
 
 
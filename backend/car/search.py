@@ -0,0 +1,143 @@
+import base64
+import json
+
+from fastapi import HTTPException
+from sqlalchemy import Integer, and_, case, column, func, literal, or_, select, text, union_all
+from sqlalchemy.orm import Session
+from typing import List, Optional, Tuple
+
+from backend.models import Car, normalize_plate
+
+# Rank buckets; integers keep the (rank, id) cursor stable between pages
+EXACT_PLATE_RANK = 3
+PLATE_PREFIX_RANK = 2
+TEXT_MATCH_RANK = 1
+
+# InnoDB's default innodb_ft_min_token_size
+MYSQL_FT_MIN_TOKEN_SIZE = 3
+
+
+def encode_cursor(rank: int, car_id: int) -> str:
+    return base64.urlsafe_b64encode(json.dumps([rank, car_id]).encode()).decode()
+
+
+def decode_cursor(cursor: str) -> Tuple[int, int]:
+    try:
+        rank, car_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return int(rank), int(car_id)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def _prefix_pattern(value: str) -> str:
+    # LIKE prefix pattern matching the value literally; used with escape="\\"
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+
+
+def _text_match(db: Session, terms: List[str]):
+    dialect = db.get_bind().dialect.name
+
+    if dialect == "mysql":
+        # InnoDB does not index tokens shorter than innodb_ft_min_token_size, so short terms such as
+        # "A4" or "X5" are matched by prefix on the ix_car_make_model columns instead. Stopwords are not
+        # indexed either; set innodb_ft_enable_stopword=OFF if a make or model can collide with one
+        long_terms = [term for term in terms if len(term) >= MYSQL_FT_MIN_TOKEN_SIZE]
+        conditions = [
+            or_(Car.make.like(f"{term}%"), Car.model.like(f"{term}%"))
+            for term in terms if len(term) < MYSQL_FT_MIN_TOKEN_SIZE
+        ]
+        if long_terms:
+            conditions.append(
+                text("MATCH (car.make, car.model) AGAINST (:car_fts_terms IN BOOLEAN MODE)").bindparams(
+                    car_fts_terms=" ".join(f"+{term}*" for term in long_terms)
+                )
+            )
+        return and_(*conditions)
+
+    if dialect == "sqlite":
+        return Car.id.in_(
+            text("SELECT rowid FROM car_fts WHERE car_fts MATCH :car_fts_terms")
+            .bindparams(car_fts_terms=" ".join(f'"{term}"*' for term in terms))
+            .columns(column("rowid", Integer))
+        )
+
+    return and_(*[or_(Car.make.ilike(f"{term}%"), Car.model.ilike(f"{term}%")) for term in terms])
+
+
+def search_cars(
+        db: Session,
+        q: Optional[str],
+        make: Optional[str],
+        model: Optional[str],
+        from_year: Optional[int],
+        to_year: Optional[int],
+        limit: int,
+        cursor: Optional[str],
+):
+    # Returns up to `limit` (car, rank) pairs ordered by rank, then id, plus the next cursor
+    rank = literal(0)
+    query = db.query(Car)
+
+    if q:
+        plate = normalize_plate(q)
+        terms = ["".join(ch for ch in word if ch.isalnum()) for word in q.split()]
+        terms = [term for term in terms if term]
+
+        # Each branch runs on its own index (normalizedPlate range, full-text); OR-ing them in
+        # one WHERE would make MySQL skip the full-text index and scan the table instead
+        branches = []
+        if plate:
+            branches.append(
+                select(
+                    Car.id.label("car_id"),
+                    case((Car.normalizedPlate == plate, EXACT_PLATE_RANK), else_=PLATE_PREFIX_RANK).label("rank"),
+                ).where(Car.normalizedPlate.like(f"{plate}%"))
+            )
+        if terms:
+            branches.append(
+                select(Car.id.label("car_id"), literal(TEXT_MATCH_RANK).label("rank"))
+                .where(_text_match(db, terms))
+            )
+        if not branches:
+            raise HTTPException(status_code=400, detail="Search query must contain letters or digits")
+
+        # A car found by both branches keeps its best rank
+        matches = union_all(*branches).subquery()
+        ranked = (
+            select(matches.c.car_id, func.max(matches.c.rank).label("rank"))
+            .group_by(matches.c.car_id)
+            .subquery()
+        )
+        query = query.join(ranked, ranked.c.car_id == Car.id)
+        rank = ranked.c.rank
+
+    if make:
+        query = query.filter(Car.make.like(_prefix_pattern(make), escape="\\"))
+
+    if model:
+        query = query.filter(Car.model.like(_prefix_pattern(model), escape="\\"))
+
+    if from_year:
+        query = query.filter(Car.productionYear >= from_year)
+
+    if to_year:
+        query = query.filter(Car.productionYear <= to_year)
+
+    if cursor:
+        last_rank, last_id = decode_cursor(cursor)
+        query = query.filter(or_(rank < last_rank, and_(rank == last_rank, Car.id > last_id)))
+
+    rows = (
+        query.add_columns(rank.label("rank"))
+        .order_by(rank.desc(), Car.id)
+        .limit(limit + 1)
+        .all()
+    )
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last_car, last_rank = rows[-1]
+        next_cursor = encode_cursor(last_rank, last_car.id)
+
+    return rows, next_cursor
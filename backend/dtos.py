@@ -1,9 +1,11 @@
 from enum import Enum
 
 from pydantic import BaseModel
-from typing import List, Optional
+from typing import Any, Dict, List, Optional, Union
 from datetime import date
 
+from backend.models import RecurrenceUnit
+
 
 
 #Garages Dtos
@@ -65,6 +67,21 @@ class ResponseCarDTO(BaseModel):
     class Config:
         from_attributes = True
 
+class CarSearchResultDTO(BaseModel):
+    id: int
+    make: str
+    model: str
+    productionYear: int
+    licensePlate: str
+    rank: int
+
+    class Config:
+        from_attributes = True
+
+class CarSearchPageDTO(BaseModel):
+    items: List[CarSearchResultDTO]
+    nextCursor: Optional[str] = None
+
 
 
 #Maintinance Dtos
@@ -90,7 +107,8 @@ class UpdateMaintenanceDTO(BaseModel):
         from_attributes = True
 
 class ResponseMaintenanceDTO(BaseModel):
-    id: int
+    # None for an occurrence of a recurring schedule that has not been confirmed yet
+    id: Optional[int]
     car_id: int
     carName: str
     serviceType: str
@@ -98,10 +116,42 @@ class ResponseMaintenanceDTO(BaseModel):
     garage_id: int
 
     garageName: str
+    schedule_id: Optional[int] = None
+
+    class Config:
+        from_attributes = True
+
+
+#Maintenance Schedule Dtos
+class CreateMaintenanceScheduleDTO(BaseModel):
+    car_id: int
+    garage_id: int
+    serviceType: str
+    startDate: date
+    endDate: Optional[date] = None
+    # Every `interval` days, weeks or months counted from startDate
+    interval: int
+    intervalUnit: RecurrenceUnit
+
+    class Config:
+        from_attributes = True
+
+class ResponseMaintenanceScheduleDTO(BaseModel):
+    id: int
+    car_id: int
+    garage_id: int
+    serviceType: str
+    startDate: date
+    endDate: Optional[date]
+    interval: int
+    intervalUnit: RecurrenceUnit
 
     class Config:
         from_attributes = True
 
+class ConfirmOccurrenceDTO(BaseModel):
+    occurrenceDate: date
+
 
 class MonthName(str, Enum):
     JANUARY = "JANUARY"
@@ -137,4 +187,125 @@ class DailyAvailabilityReportDTO(BaseModel):
     availableCapacity: int
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+#Archive Dtos
+class ArchiveRunDTO(BaseModel):
+    cutoffDate: date
+    archived: int
+
+    class Config:
+        from_attributes = True
+
+
+
+#Report Job Dtos
+class ReportType(str, Enum):
+    MONTHLY_REQUESTS = "MONTHLY_REQUESTS"
+    DAILY_AVAILABILITY = "DAILY_AVAILABILITY"
+
+
+class ReportJobStatus(str, Enum):
+    PENDING = "PENDING"
+    RUNNING = "RUNNING"
+    DONE = "DONE"
+    FAILED = "FAILED"
+
+
+class CreateReportJobDTO(BaseModel):
+    reportType: ReportType
+    garageIds: List[int]
+    # YYYY-MM for monthly request reports, YYYY-MM-DD for daily availability reports
+    start: str
+    end: str
+
+
+class ReportJobDTO(BaseModel):
+    id: str
+    reportType: ReportType
+    garageIds: List[int]
+    start: str
+    end: str
+    status: ReportJobStatus
+    cached: bool
+    error: Optional[str] = None
+
+
+class ReportJobResultDTO(BaseModel):
+    id: str
+    reportType: ReportType
+    reports: Dict[int, Union[List[MonthlyRequestsReportDTO], List[DailyAvailabilityReportDTO]]]
+
+
+#Admission Dtos
+class AdmissionStatsDTO(BaseModel):
+    limit: int
+    active: int
+    queued: int
+    maxQueue: int
+    admitted: int
+    shed: int
+    avgServiceTime: float
+
+
+#Batch Dtos
+class BatchOperationDTO(BaseModel):
+    method: str
+    # May carry its own query string, e.g. /maintenance?carId=1
+    path: str
+    query: Dict[str, Any] = {}
+    body: Optional[Any] = None
+
+
+class BatchRequestDTO(BaseModel):
+    operations: List[BatchOperationDTO]
+    # Run every operation in one transaction and roll all of them back if any fails
+    atomic: bool = False
+
+
+class BatchOperationResultDTO(BaseModel):
+    status: int
+    body: Optional[Any] = None
+
+
+class BatchResponseDTO(BaseModel):
+    committed: bool
+    results: List[BatchOperationResultDTO]
+
+
+#Analytics Dtos
+class GarageUtilizationDTO(BaseModel):
+    garage_id: int
+    garageName: str
+    city: str
+    capacity: int
+    requests: int
+    # Booked slots divided by capacity, averaged over the days of the window
+    averageOccupancy: float
+    peakDate: date
+    peakOccupancy: float
+    overbookedDays: int
+    serviceTypes: Dict[str, int]
+
+
+class CityUtilizationDTO(BaseModel):
+    city: str
+    garages: int
+    capacity: int
+    requests: int
+    averageOccupancy: float
+    peakDate: date
+    peakOccupancy: float
+    serviceTypes: Dict[str, int]
+
+
+class UtilizationReportDTO(BaseModel):
+    startDate: date
+    endDate: date
+    garages: List[GarageUtilizationDTO]
+    cities: List[CityUtilizationDTO]
+    requests: int
+    averageOccupancy: float
+    peakDate: date
+    peakOccupancy: float
+    serviceTypes: Dict[str, int]
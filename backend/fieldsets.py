@@ -0,0 +1,22 @@
+from fastapi import HTTPException
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from typing import Iterable, List, Optional
+
+
+def parse_fields(fields: Optional[str], allowed: Iterable[str]) -> Optional[List[str]]:
+    # Turns "id,licensePlate" into ["id", "licensePlate"]; None means the full response shape
+    if not fields:
+        return None
+
+    selected = list(dict.fromkeys(field.strip() for field in fields.split(",") if field.strip()))
+    unknown = [field for field in selected if field not in allowed]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown)}")
+
+    return selected or None
+
+
+def sparse_response(rows: List[dict]) -> JSONResponse:
+    # Partial rows do not match the full response_model, so they bypass its validation
+    return JSONResponse(content=jsonable_encoder(rows))
@@ -0,0 +1,186 @@
+import gzip
+import hashlib
+import json
+import mimetypes
+import os
+
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Optional
+
+from starlette.responses import FileResponse, Response
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+FRONTEND_DIR = Path(__file__).resolve().parents[2] / "car-management-frontend"
+
+# Hashed file names change with their content, so browsers may keep them forever
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+REVALIDATE_CACHE_CONTROL = "no-cache"
+
+COMPRESSIBLE_SUFFIXES = {".js", ".css", ".map", ".html", ".json", ".txt", ".svg"}
+# Source maps are large and only fetched by developer tools, so brotli at quality 11 is not worth it
+GZIP_ONLY_SUFFIXES = {".map"}
+MIN_COMPRESS_SIZE = 1024
+
+# Browser navigations to these paths must still reach FastAPI
+API_DOC_PATHS = {"/docs", "/docs/oauth2-redirect", "/redoc", "/openapi.json"}
+
+# Preferred first when the client accepts several encodings
+ENCODINGS = ("br", "gzip")
+ENCODING_SUFFIXES = {"br": ".br", "gzip": ".gz"}
+
+
+@dataclass
+class AssetVariant:
+    path: Path
+    stat: os.stat_result
+    etag: str
+
+
+@dataclass
+class Asset:
+    media_type: str
+    cache_control: str
+    variants: Dict[str, AssetVariant] = field(default_factory=dict)
+
+
+def _compress(content: bytes, encoding: str) -> Optional[bytes]:
+    if encoding == "gzip":
+        return gzip.compress(content, compresslevel=9, mtime=0)
+    if encoding == "br" and brotli is not None:
+        return brotli.compress(content, quality=11)
+    return None
+
+
+class FrontendAssets:
+    """The built frontend, indexed once at startup with precompressed variants and ETags."""
+
+    def __init__(self, directory: Path = FRONTEND_DIR):
+        self.directory = directory
+        self.assets: Dict[str, Asset] = {}
+        self.index: Optional[Asset] = None
+
+    def load(self):
+        manifest_path = self.directory / "asset-manifest.json"
+        if not manifest_path.is_file():
+            print(f"No frontend build found in {self.directory}, serving the API only.")
+            return
+
+        with open(manifest_path) as manifest_file:
+            manifest = json.load(manifest_file)
+        hashed = {"/" + path.lstrip("/") for path in manifest["files"].values()} - {"/index.html"}
+
+        files = [self.directory / "index.html"] + sorted((self.directory / "static").rglob("*"))
+        for path in files:
+            if not path.is_file() or path.suffix in ENCODING_SUFFIXES.values():
+                continue
+            url = "/" + path.relative_to(self.directory).as_posix()
+            self.assets[url] = self._build(path, url in hashed)
+
+        self.index = self.assets.get("/index.html")
+
+    def _build(self, path: Path, immutable: bool) -> Asset:
+        content = path.read_bytes()
+        digest = hashlib.sha256(content).hexdigest()[:20]
+        media_type = "application/json" if path.suffix == ".map" else \
+            mimetypes.guess_type(path.name)[0] or "application/octet-stream"
+
+        asset = Asset(
+            media_type=media_type,
+            cache_control=IMMUTABLE_CACHE_CONTROL if immutable else REVALIDATE_CACHE_CONTROL,
+        )
+        asset.variants["identity"] = AssetVariant(path, path.stat(), f'"{digest}"')
+
+        if path.suffix not in COMPRESSIBLE_SUFFIXES or len(content) < MIN_COMPRESS_SIZE:
+            return asset
+
+        for encoding in ENCODINGS:
+            if encoding == "br" and path.suffix in GZIP_ONLY_SUFFIXES:
+                continue
+            # Variants are written next to the original once and reused while they are newer
+            variant_path = path.with_name(path.name + ENCODING_SUFFIXES[encoding])
+            if not variant_path.is_file() or variant_path.stat().st_mtime < path.stat().st_mtime:
+                compressed = _compress(content, encoding)
+                if compressed is None:
+                    continue
+                try:
+                    variant_path.write_bytes(compressed)
+                except OSError as e:
+                    # A read-only build directory only costs us the compressed variant
+                    print(f"Could not write {variant_path}, serving {path.name} without {encoding}: {e}")
+                    continue
+
+            variant_stat = variant_path.stat()
+            if variant_stat.st_size < len(content):
+                asset.variants[encoding] = AssetVariant(variant_path, variant_stat, f'"{digest}-{encoding}"')
+
+        return asset
+
+    @staticmethod
+    def _accepted_encodings(accept_encoding: str):
+        accepted = set()
+        for part in accept_encoding.split(","):
+            name, _, params = part.strip().partition(";")
+            if params.strip().replace(" ", "") in ("q=0", "q=0.0", "q=0.00", "q=0.000"):
+                continue
+            accepted.add(name.strip().lower())
+        return accepted
+
+    def response(self, asset: Asset, headers: Dict[str, str], vary: str = "Accept-Encoding") -> Response:
+        accepted = self._accepted_encodings(headers.get("accept-encoding", ""))
+        encoding = next(
+            (encoding for encoding in ENCODINGS if encoding in asset.variants and encoding in accepted),
+            "identity",
+        )
+        variant = asset.variants[encoding]
+
+        response_headers = {
+            "cache-control": asset.cache_control,
+            "etag": variant.etag,
+            "vary": vary,
+        }
+
+        if variant.etag in [tag.strip() for tag in headers.get("if-none-match", "").split(",")]:
+            return Response(status_code=304, headers=response_headers)
+
+        if encoding != "identity":
+            response_headers["content-encoding"] = encoding
+
+        # FileResponse streams straight from disk, using the server's pathsend extension when it has one
+        return FileResponse(
+            variant.path,
+            stat_result=variant.stat,
+            media_type=asset.media_type,
+            headers=response_headers,
+        )
+
+
+class FrontendMiddleware:
+    def __init__(self, app, assets: FrontendAssets):
+        self.app = app
+        self.assets = assets
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] not in ("GET", "HEAD") or self.assets.index is None:
+            await self.app(scope, receive, send)
+            return
+
+        headers = {name.decode("latin-1"): value.decode("latin-1") for name, value in scope["headers"]}
+
+        asset = self.assets.assets.get(scope["path"])
+        if asset is None:
+            # Client-side routes such as /cars share their paths with the API, so only
+            # browser navigations (which ask for HTML) fall back to index.html
+            if scope["path"] in API_DOC_PATHS or "text/html" not in headers.get("accept", ""):
+                await self.app(scope, receive, send)
+                return
+            # The same URL answers API fetches with JSON, so caches must key on Accept too
+            response = self.assets.response(self.assets.index, headers, vary="Accept, Accept-Encoding")
+        else:
+            response = self.assets.response(asset, headers)
+
+        await response(scope, receive, send)
@@ -1,8 +1,8 @@
 from fastapi import APIRouter, HTTPException, Depends
 from sqlalchemy.orm import Session
 from typing import List
-from datetime import datetime, timedelta
-from backend.models import Garage, MaintenanceRequest
+from datetime import datetime
+from backend.models import Garage, MaintenanceRequest, MaintenanceRequestArchive, MaintenanceSchedule
 from backend.dtos import (
     CreateGarageDTO,
     UpdateGarageDTO,
@@ -10,6 +10,7 @@ from backend.dtos import (
     DailyAvailabilityReportDTO,
 )
 from backend.database import get_db
+from backend.report.queries import count_requests_by_day, build_daily_availability_report
 
 router = APIRouter()
 
@@ -45,6 +46,19 @@ def delete_garage(id: int, db: Session = Depends(get_db)):
     if not garage:
         raise HTTPException(status_code=404, detail="Garage not found")
 
+    # Archived requests have no foreign key to the garage, so they are removed explicitly
+    db.query(MaintenanceRequestArchive).filter(MaintenanceRequestArchive.garage_id == id).delete()
+
+    # The garage's schedules go with it; their confirmed occurrences stay as ordinary requests
+    schedule_ids = [schedule_id for (schedule_id,) in
+                    db.query(MaintenanceSchedule.id).filter(MaintenanceSchedule.garage_id == id).all()]
+    if schedule_ids:
+        for source in (MaintenanceRequest, MaintenanceRequestArchive):
+            db.query(source).filter(source.schedule_id.in_(schedule_ids)).update(
+                {source.schedule_id: None, source.occurrenceDate: None}, synchronize_session=False
+            )
+        db.query(MaintenanceSchedule).filter(MaintenanceSchedule.garage_id == id).delete()
+
     db.delete(garage)
     db.commit()
     return {"success": True}
@@ -96,29 +110,7 @@ def daily_availability_report(
     if not garage:
         raise HTTPException(status_code=404, detail="Garage not found")
 
-    # Start with the static available capacity (before maintenance requests)
-    available_capacity = garage.capacity
-
-    # Generate the report
-    report = []
-    current_date = start_date
-    while current_date <= end_date:
-        # Query the number of maintenance requests for this specific day
-        maintenance_requests_count = db.query(MaintenanceRequest).filter(
-            MaintenanceRequest.garage_id == garage_id,
-            MaintenanceRequest.scheduledDate == current_date  # Match the date exactly
-        ).count()
-
-        # Adjust the available capacity based on the number of requests for this day
-        daily_available_capacity = available_capacity - maintenance_requests_count
-
-        # Append the report entry for this day
-        report.append(DailyAvailabilityReportDTO(
-            date=current_date,
-            availableCapacity=daily_available_capacity
-        ))
-
-        # Move to the next day
-        current_date += timedelta(days=1)
+    # Count the maintenance requests for every day of the range in one grouped query
+    counts = count_requests_by_day(db, [garage_id], start_date, end_date)
 
-    return report
\ No newline at end of file
+    return build_daily_availability_report(counts, garage, start_date, end_date)
@@ -0,0 +1,287 @@
+import asyncio
+import hashlib
+import json
+import re
+import time
+
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import List, Optional, Tuple
+
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+from starlette.responses import JSONResponse
+
+from backend.models import IdempotencyKey
+
+IDEMPOTENCY_HEADER = "idempotency-key"
+REPLAYED_HEADER = "idempotent-replayed"
+MAX_KEY_LENGTH = 255
+
+# Stored outcomes are replayed for this long
+IDEMPOTENCY_TTL_SECONDS = 24 * 60 * 60
+# A duplicate waits this long for the first request before giving up with 409
+IDEMPOTENCY_WAIT_SECONDS = 30.0
+# An unfinished database record is only taken over after this long, far longer than any request
+# runs, so a slow first request is never executed a second time
+IDEMPOTENCY_LEASE_SECONDS = 15 * 60.0
+
+IDEMPOTENT_METHODS = ("POST", "PUT")
+IDEMPOTENT_PATH = re.compile(r"^/(cars|garages|maintenance|schedules|batch)(/|$)")
+
+
+class IdempotencyKeyMismatch(Exception):
+    """The key was already used for a different request."""
+
+
+class IdempotencyKeyInProgress(Exception):
+    """The first request with this key did not finish within the wait."""
+
+
+@dataclass
+class StoredResponse:
+    status: int
+    headers: List[Tuple[str, str]]
+    body: bytes
+
+
+@dataclass
+class _MemoryEntry:
+    fingerprint: str
+    expires: float
+    response: Optional[StoredResponse] = None
+    done: asyncio.Event = field(default_factory=asyncio.Event)
+
+
+class MemoryIdempotencyStore:
+    """Bounded, expiring in-process store; duplicates wait on an event instead of polling."""
+
+    def __init__(self, max_entries: int = 10000, ttl: float = IDEMPOTENCY_TTL_SECONDS,
+                 wait_timeout: float = IDEMPOTENCY_WAIT_SECONDS):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.wait_timeout = wait_timeout
+        self._entries: "OrderedDict[str, _MemoryEntry]" = OrderedDict()
+
+    async def begin(self, key: str, fingerprint: str) -> Optional[StoredResponse]:
+        # Returns the stored response, or None when the caller now owns the key and must run the request
+        deadline = time.monotonic() + self.wait_timeout
+        while True:
+            self._evict()
+            entry = self._entries.get(key)
+            if entry is None:
+                self._entries[key] = _MemoryEntry(fingerprint=fingerprint, expires=time.monotonic() + self.ttl)
+                return None
+            if entry.fingerprint != fingerprint:
+                raise IdempotencyKeyMismatch()
+            if entry.response is not None:
+                return entry.response
+
+            try:
+                await asyncio.wait_for(entry.done.wait(), deadline - time.monotonic())
+            except asyncio.TimeoutError:
+                raise IdempotencyKeyInProgress()
+            # Woken either with a response or because the owner abandoned the key; look again
+
+    async def complete(self, key: str, response: StoredResponse):
+        entry = self._entries.get(key)
+        if entry is not None:
+            entry.response = response
+            entry.done.set()
+
+    async def abandon(self, key: str):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            entry.done.set()
+
+    def _evict(self):
+        now = time.monotonic()
+        # Entries share one TTL, so the expired ones are at the front
+        while self._entries:
+            key, entry = next(iter(self._entries.items()))
+            if entry.expires > now:
+                break
+            del self._entries[key]
+            entry.done.set()
+
+        # Over capacity, drop the oldest finished entries; keys whose first request still runs are kept
+        overflow = len(self._entries) - self.max_entries + 1
+        if overflow > 0:
+            finished = [key for key, entry in self._entries.items() if entry.response is not None]
+            for key in finished[:overflow]:
+                del self._entries[key]
+
+
+class DatabaseIdempotencyStore:
+    """Store backed by the idempotencykey table, shared by every worker process."""
+
+    def __init__(self, engine, ttl: float = IDEMPOTENCY_TTL_SECONDS,
+                 wait_timeout: float = IDEMPOTENCY_WAIT_SECONDS, poll_interval: float = 0.1,
+                 lease_timeout: float = IDEMPOTENCY_LEASE_SECONDS):
+        self.engine = engine
+        self.ttl = ttl
+        self.wait_timeout = wait_timeout
+        self.lease_timeout = lease_timeout
+        self.poll_interval = poll_interval
+
+    async def begin(self, key: str, fingerprint: str) -> Optional[StoredResponse]:
+        deadline = time.monotonic() + self.wait_timeout
+        while time.monotonic() < deadline:
+            acquired, response = await run_in_threadpool(self._try_begin, key, fingerprint)
+            if acquired:
+                return None
+            if response is not None:
+                return response
+            await asyncio.sleep(self.poll_interval)
+        raise IdempotencyKeyInProgress()
+
+    async def complete(self, key: str, response: StoredResponse):
+        await run_in_threadpool(self._complete, key, response)
+
+    async def abandon(self, key: str):
+        await run_in_threadpool(self._abandon, key)
+
+    def _try_begin(self, key: str, fingerprint: str) -> Tuple[bool, Optional[StoredResponse]]:
+        now = time.time()
+        with Session(self.engine) as db:
+            record = db.get(IdempotencyKey, key)
+            # An unfinished record older than the lease belongs to a worker that died mid-request
+            stale = record is not None and record.statusCode is None and \
+                record.createdAt < now - self.lease_timeout
+            if record is not None and (record.expiresAt < now or stale):
+                db.delete(record)
+                db.commit()
+                record = None
+
+            if record is None:
+                db.add(IdempotencyKey(
+                    key=key,
+                    fingerprint=fingerprint,
+                    createdAt=now,
+                    expiresAt=now + self.ttl,
+                ))
+                try:
+                    db.commit()
+                except IntegrityError:
+                    # Another worker inserted the key first
+                    db.rollback()
+                    return False, None
+                return True, None
+
+            if record.fingerprint != fingerprint:
+                raise IdempotencyKeyMismatch()
+            if record.statusCode is None:
+                return False, None
+            return False, StoredResponse(
+                status=record.statusCode,
+                headers=[tuple(header) for header in json.loads(record.headers)],
+                body=record.body,
+            )
+
+    def _complete(self, key: str, response: StoredResponse):
+        with Session(self.engine) as db:
+            # Only the first outcome is kept, even if a stale record was taken over meanwhile
+            db.query(IdempotencyKey).filter(
+                IdempotencyKey.key == key, IdempotencyKey.statusCode.is_(None)
+            ).update({
+                IdempotencyKey.statusCode: response.status,
+                IdempotencyKey.headers: json.dumps(response.headers),
+                IdempotencyKey.body: response.body,
+            }, synchronize_session=False)
+            db.query(IdempotencyKey).filter(IdempotencyKey.expiresAt < time.time()).delete()
+            db.commit()
+
+    def _abandon(self, key: str):
+        with Session(self.engine) as db:
+            db.query(IdempotencyKey).filter(
+                IdempotencyKey.key == key, IdempotencyKey.statusCode.is_(None)
+            ).delete()
+            db.commit()
+
+
+class IdempotencyMiddleware:
+    def __init__(self, app, store=None):
+        self.app = app
+        self.store = store if store is not None else MemoryIdempotencyStore()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] not in IDEMPOTENT_METHODS \
+                or not IDEMPOTENT_PATH.match(scope["path"]):
+            await self.app(scope, receive, send)
+            return
+
+        key = dict(scope["headers"]).get(IDEMPOTENCY_HEADER.encode())
+        if key is None:
+            await self.app(scope, receive, send)
+            return
+
+        key = key.decode("latin-1")
+        if not key or len(key) > MAX_KEY_LENGTH:
+            await self._error(scope, receive, send, 400, "Invalid Idempotency-Key header")
+            return
+
+        body = await self._read_body(receive)
+        fingerprint = hashlib.sha256(
+            scope["method"].encode() + b" " + scope["path"].encode() + b"?" + scope["query_string"] + b"\n" + body
+        ).hexdigest()
+
+        try:
+            stored = await self.store.begin(key, fingerprint)
+        except IdempotencyKeyMismatch:
+            await self._error(scope, receive, send, 422, "Idempotency-Key was already used for a different request")
+            return
+        except IdempotencyKeyInProgress:
+            await self._error(scope, receive, send, 409, "A request with this Idempotency-Key is still in progress")
+            return
+
+        if stored is not None:
+            await self._replay(stored, send)
+            return
+
+        captured = {"headers": [], "body": b""}
+
+        async def replay_body():
+            return {"type": "http.request", "body": body, "more_body": False}
+
+        async def capture(message):
+            if message["type"] == "http.response.start":
+                captured["status"] = message["status"]
+                captured["headers"] = [
+                    (name.decode("latin-1"), value.decode("latin-1")) for name, value in message.get("headers", [])
+                ]
+            elif message["type"] == "http.response.body":
+                captured["body"] += message.get("body", b"")
+            await send(message)
+
+        try:
+            await self.app(scope, replay_body, capture)
+        except BaseException:
+            await self.store.abandon(key)
+            raise
+
+        # Server errors are not stored, so the client can retry them
+        if captured.get("status", 500) >= 500:
+            await self.store.abandon(key)
+        else:
+            await self.store.complete(key, StoredResponse(captured["status"], captured["headers"], captured["body"]))
+
+    @staticmethod
+    async def _read_body(receive) -> bytes:
+        body = b""
+        while True:
+            message = await receive()
+            body += message.get("body", b"")
+            if not message.get("more_body", False):
+                return body
+
+    @staticmethod
+    async def _replay(stored: StoredResponse, send):
+        headers = [(name.encode("latin-1"), value.encode("latin-1")) for name, value in stored.headers]
+        headers.append((REPLAYED_HEADER.encode(), b"true"))
+        await send({"type": "http.response.start", "status": stored.status, "headers": headers})
+        await send({"type": "http.response.body", "body": stored.body})
+
+    @staticmethod
+    async def _error(scope, receive, send, status_code: int, detail: str):
+        await JSONResponse(status_code=status_code, content={"detail": detail})(scope, receive, send)
@@ -1,10 +1,42 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
+from starlette.concurrency import run_in_threadpool
 from backend.garage.garage import router as garage_router
 from backend.maintenance.maintenance import router as maintenance_router
 from backend.car.car import router as car_router
+from backend.schedule.schedule import router as schedule_router
+from backend.archive.archive import router as archive_router
+from backend.report.report import router as report_router
+from backend.batch.batch import router as batch_router
+from backend.analytics.analytics import router as analytics_router
+from backend.admission.admission import router as admission_router, AdmissionControlMiddleware
+from backend.idempotency.idempotency import IdempotencyMiddleware, MemoryIdempotencyStore
+from backend.frontend.frontend import FrontendAssets, FrontendMiddleware
 from fastapi.middleware.cors import CORSMiddleware
 
-app = FastAPI()
+frontend_assets = FrontendAssets()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Reads asset-manifest.json and precompresses the build once per start, off the event loop
+    await run_in_threadpool(frontend_assets.load)
+    yield
+
+
+app = FastAPI(lifespan=lifespan)
+
+# Added before CORS so that shed 503 responses still carry CORS headers
+app.add_middleware(AdmissionControlMiddleware)
+
+# Outside admission control, so replayed responses are answered even when the API is saturated.
+# Use DatabaseIdempotencyStore(create_engine(DATABASE_URL, pool_size=2)) to share keys between several
+# worker processes; give it its own engine so it stays outside the pool budget in backend/admission.
+app.add_middleware(IdempotencyMiddleware, store=MemoryIdempotencyStore())
+
+# Static files never touch the database, so they are served before admission control
+app.add_middleware(FrontendMiddleware, assets=frontend_assets)
 
 app.add_middleware(
     CORSMiddleware,
@@ -17,6 +49,12 @@ app.add_middleware(
 app.include_router(garage_router)
 app.include_router(maintenance_router)
 app.include_router(car_router)
+app.include_router(schedule_router)
+app.include_router(archive_router)
+app.include_router(report_router)
+app.include_router(batch_router)
+app.include_router(analytics_router)
+app.include_router(admission_router)
 
 @app.get("/")
 def read_root():
@@ -1,21 +1,27 @@
-import calendar
-
 from fastapi import APIRouter, HTTPException, Depends, Query
 from sqlalchemy.orm import Session
 from typing import List
-from datetime import datetime, timedelta
-from backend.models import MaintenanceRequest, Car, Garage
+from datetime import date, datetime, timedelta
+from backend.models import MaintenanceRequest, MaintenanceRequestArchive, Car, Garage
 from backend.dtos import (
     CreateMaintenanceDTO,
     UpdateMaintenanceDTO,
     ResponseMaintenanceDTO,
-    MonthlyRequestsReportDTO, MonthName, YearMonth
+    MonthlyRequestsReportDTO
 )
 from backend.database import get_db
+from backend.archive.archive import reaches_archive
+from backend.report.queries import count_requests_by_day, month_starts, month_end, build_monthly_report
+from backend.fieldsets import parse_fields, sparse_response
+from backend.schedule.schedule import SCHEDULE_HORIZON_DAYS, expand_schedules, occurrence_to_dto
 
 
 router = APIRouter()
 
+MAINTENANCE_FIELDS = (
+    "id", "car_id", "carName", "serviceType", "scheduledDate", "garage_id", "garageName", "schedule_id"
+)
+
 
 @router.get("/maintenance/{id}", response_model=ResponseMaintenanceDTO, tags=["Maintenance Controller"])
 def get_maintenance_by_id(id: int, db: Session = Depends(get_db)):
@@ -24,6 +30,8 @@ def get_maintenance_by_id(id: int, db: Session = Depends(get_db)):
         .filter(MaintenanceRequest.id == id)
         .first()
     )
+    if not maintenance:
+        maintenance = db.get(MaintenanceRequestArchive, id)
     if not maintenance:
         raise HTTPException(status_code=404, detail="Maintenance record not found")
 
@@ -49,6 +57,7 @@ def get_maintenance_by_id(id: int, db: Session = Depends(get_db)):
         scheduledDate=maintenance.scheduledDate,
         garage_id=maintenance.garage_id,
         garageName=garage.name,
+        schedule_id=maintenance.schedule_id,
     )
 
 @router.put("/maintenance/{id}", response_model=ResponseMaintenanceDTO, tags=["Maintenance Controller"])
@@ -87,11 +96,11 @@ def update_maintenance(id: int, update: UpdateMaintenanceDTO, db: Session = Depe
 def create_maintenance_request(
     maintenance: CreateMaintenanceDTO, db: Session = Depends(get_db)
 ):
-    car = db.query(Car).filter(Car.id == maintenance.carId).first()
+    car = db.query(Car).filter(Car.id == maintenance.car_id).first()
     if not car:
         raise HTTPException(status_code=404, detail="Car not found")
 
-    garage = db.query(Garage).filter(Garage.id == maintenance.garageId).first()
+    garage = db.query(Garage).filter(Garage.id == maintenance.garage_id).first()
     if not garage:
         raise HTTPException(status_code=404, detail="Garage not found")
 
@@ -100,10 +109,10 @@ def create_maintenance_request(
 
     # Create the maintenance request in the database
     maintenance_request = MaintenanceRequest(
-        car_id=maintenance.carId,
+        car_id=maintenance.car_id,
         serviceType=maintenance.serviceType,
         scheduledDate=maintenance.scheduledDate,
-        garage_id=maintenance.garageId,
+        garage_id=maintenance.garage_id,
     )
 
     db.add(maintenance_request)
@@ -138,30 +147,77 @@ def get_maintenance_list(
         garageId: int = None,
         startDate: str = None,
         endDate: str = None,
+        fields: str = None,
         db: Session = Depends(get_db)
 ):
+    selected = parse_fields(fields, MAINTENANCE_FIELDS)
+
+    start_date = datetime.strptime(startDate, "%Y-%m-%d") if startDate else None
+    end_date = datetime.strptime(endDate, "%Y-%m-%d") if endDate else None
+
+    sources = [MaintenanceRequest]
+    if reaches_archive(db, start_date.date() if start_date else None):
+        sources.append(MaintenanceRequestArchive)
+
+    maintenance_records = []
+    for source in sources:
+        if selected:
+            # Select only the requested columns and join car/garage only for their names
+            columns = [
+                getattr(source, field).label(field)
+                for field in selected if field not in ("carName", "garageName")
+            ]
+            if "carName" in selected:
+                columns.append(Car.make.label("carName"))
+            if "garageName" in selected:
+                columns.append(Garage.name.label("garageName"))
+
+            query = db.query(*columns).select_from(source)
+            if "carName" in selected:
+                query = query.join(Car, Car.id == source.car_id)
+            if "garageName" in selected:
+                query = query.join(Garage, Garage.id == source.garage_id)
+        else:
+            query = db.query(source)
+
+        if carId:
+            query = query.filter(source.car_id == carId)
+
+        if garageId:
+            query = query.filter(source.garage_id == garageId)
+
+        if start_date:
+            query = query.filter(source.scheduledDate >= start_date)
+
+        if end_date:
+            query = query.filter(source.scheduledDate <= end_date)
+
+        maintenance_records.extend(query.all())
+
+    # Unconfirmed occurrences of recurring schedules are expanded on the fly, never stored;
+    # an open end reaches SCHEDULE_HORIZON_DAYS past the start (or today), an open start as far back
+    anchor = start_date.date() if start_date else date.today()
+    expansion_end = end_date.date() if end_date else anchor + timedelta(days=SCHEDULE_HORIZON_DAYS)
+    expansion_start = start_date.date() if start_date else \
+        min(anchor, expansion_end) - timedelta(days=SCHEDULE_HORIZON_DAYS)
+    occurrences = expand_schedules(
+        db,
+        expansion_start,
+        expansion_end,
+        car_id=carId,
+        garage_ids=[garageId] if garageId else None,
+    )
+    occurrence_dtos = [occurrence_to_dto(schedule, occurrence) for schedule, occurrence in occurrences]
 
-    query = db.query(MaintenanceRequest)
-
-    if carId:
-        query = query.filter(MaintenanceRequest.car_id == carId)
-
-    if garageId:
-        query = query.filter(MaintenanceRequest.garage_id == garageId)
-
-    if startDate:
-        start_date = datetime.strptime(startDate, "%Y-%m-%d")
-        query = query.filter(MaintenanceRequest.scheduledDate >= start_date)
-
-    if endDate:
-        end_date = datetime.strptime(endDate, "%Y-%m-%d")
-        query = query.filter(MaintenanceRequest.scheduledDate <= end_date)
-
-    maintenance_records = query.all()
-
-    if not maintenance_records:
+    if not maintenance_records and not occurrence_dtos:
         raise HTTPException(status_code=404, detail="No maintenance records found")
 
+    if selected:
+        return sparse_response(
+            [record._asdict() for record in maintenance_records]
+            + [{field: getattr(dto, field) for field in selected} for dto in occurrence_dtos]
+        )
+
     response_data = []
     for maintenance in maintenance_records:
         car = db.query(Car).filter(Car.id == maintenance.car_id).first()
@@ -177,9 +233,12 @@ def get_maintenance_list(
             serviceType=maintenance.serviceType,
             scheduledDate=maintenance.scheduledDate,
             garage_id=maintenance.garage_id,
-            garageName=garage.name
+            garageName=garage.name,
+            schedule_id=maintenance.schedule_id,
         ))
 
+    response_data.extend(occurrence_dtos)
+
     return response_data
 
 
@@ -200,49 +259,10 @@ def get_monthly_report(
         raise HTTPException(status_code=400, detail="Invalid date format, expected YYYY-MM")
 
 
-    monthly_report = []
-
-
-    while start_date <= end_date:
-
-        current_month = start_date.strftime("%Y-%m")
-
-
-        year = start_date.year
-        month = start_date.month
-        last_day = calendar.monthrange(year, month)[1]
-
-
-        end_of_month = datetime(year, month, last_day)
-
-
-        num_requests = db.query(MaintenanceRequest).filter(
-            MaintenanceRequest.garage_id == garage_id,
-            MaintenanceRequest.scheduledDate >= start_date,
-            MaintenanceRequest.scheduledDate <= end_of_month
-        ).count()
-
-
-        try:
-            month_name = MonthName(start_date.strftime("%B").upper())
-        except ValueError:
-            raise HTTPException(status_code=400, detail="Invalid month value")
-
-
-        leap_year = (year % 4 == 0 and (year % 100 != 0 or year % 400 == 0))
-
-
-        year_month = YearMonth(
-            year=year,
-            month=month_name,
-            leapYear=leap_year,
-            monthValue=month
-        )
-
-
-        monthly_report.append(MonthlyRequestsReportDTO(yearMonth=year_month, requests=num_requests))
-
+    months = month_starts(start_date.date(), end_date.date())
+    if not months:
+        return []
 
-        start_date = (start_date.replace(day=28) + timedelta(days=4)).replace(day=1)
+    counts = count_requests_by_day(db, [garage_id], months[0], month_end(months[-1]))
 
-    return monthly_report
\ No newline at end of file
+    return build_monthly_report(counts, garage_id, months)
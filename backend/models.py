@@ -1,3 +1,4 @@
+from sqlalchemy import DDL, Column, Index, LargeBinary, Text, UniqueConstraint, event
 from sqlmodel import Field, SQLModel, Relationship
 from typing import List
 from datetime import date
@@ -11,18 +12,50 @@ class CarGarage(SQLModel, table=True):
     garage_id: int = Field(foreign_key="garage.id", primary_key=True)
 
 
+def normalize_plate(plate: str) -> str:
+    # "CA 1234-AB" and "ca1234ab" are the same plate
+    return "".join(ch for ch in plate if ch.isalnum()).upper()
+
+
 class Car(SQLModel, table=True):
+    __table_args__ = (
+        Index("ix_car_make_model", "make", "model", mysql_length={"make": 32, "model": 32}),
+        Index("ix_car_make_model_fulltext", "make", "model", mysql_prefix="FULLTEXT").ddl_if(dialect="mysql"),
+    )
+
     id: int = Field(default=None, primary_key=True)
     make: str
     model: str
-    productionYear: int
+    productionYear: int = Field(index=True)
     licensePlate: str
+    normalizedPlate: Optional[str] = Field(default=None, index=True)
 
     garages: List["Garage"] = Relationship(back_populates="cars", link_model=CarGarage)
 
     maintenance_requests: List["MaintenanceRequest"] = Relationship(back_populates="car")
 
 
+@event.listens_for(Car, "before_insert")
+@event.listens_for(Car, "before_update")
+def set_normalized_plate(mapper, connection, car):
+    car.normalizedPlate = normalize_plate(car.licensePlate or "")
+
+
+# MySQL answers make/model search from the FULLTEXT index, SQLite from this FTS5 table
+for statement in (
+    "CREATE VIRTUAL TABLE car_fts USING fts5(make, model, content='car', content_rowid='id')",
+    "CREATE TRIGGER car_fts_insert AFTER INSERT ON car BEGIN "
+    "INSERT INTO car_fts(rowid, make, model) VALUES (new.id, new.make, new.model); END",
+    "CREATE TRIGGER car_fts_delete AFTER DELETE ON car BEGIN "
+    "INSERT INTO car_fts(car_fts, rowid, make, model) VALUES ('delete', old.id, old.make, old.model); END",
+    "CREATE TRIGGER car_fts_update AFTER UPDATE ON car BEGIN "
+    "INSERT INTO car_fts(car_fts, rowid, make, model) VALUES ('delete', old.id, old.make, old.model); "
+    "INSERT INTO car_fts(rowid, make, model) VALUES (new.id, new.make, new.model); END",
+):
+    event.listen(Car.__table__, "after_create", DDL(statement).execute_if(dialect="sqlite"))
+event.listen(Car.__table__, "before_drop", DDL("DROP TABLE IF EXISTS car_fts").execute_if(dialect="sqlite"))
+
+
 class Garage(SQLModel, table=True):
     id: int = Field(default=None, primary_key=True)
     name: str
@@ -35,13 +68,93 @@ class Garage(SQLModel, table=True):
     maintenance_requests: List["MaintenanceRequest"] = Relationship(back_populates="garage")
 
 
+class RecurrenceUnit(str, Enum):
+    DAYS = "DAYS"
+    WEEKS = "WEEKS"
+    MONTHS = "MONTHS"
+
+
+class MaintenanceSchedule(SQLModel, table=True):
+    id: int = Field(default=None, primary_key=True)
+    car_id: int = Field(foreign_key="car.id", index=True)
+    garage_id: int = Field(foreign_key="garage.id", index=True)
+    serviceType: str
+    startDate: date
+    endDate: Optional[date] = None
+    interval: int
+    intervalUnit: RecurrenceUnit
+
+    car: Car = Relationship()
+
+    garage: Garage = Relationship()
+
+
 class MaintenanceRequest(SQLModel, table=True):
+    # An occurrence is materialized at most once, even when two confirmations race
+    __table_args__ = (
+        UniqueConstraint("schedule_id", "occurrenceDate", name="uq_maintenancerequest_occurrence"),
+    )
+
     id: int = Field(default=None, primary_key=True)
     car_id: int = Field(foreign_key="car.id")
     garage_id: int = Field(foreign_key="garage.id")
     serviceType: str
-    scheduledDate: date
+    scheduledDate: date = Field(index=True)
+    # Set when the request was materialized from an occurrence of a recurring schedule
+    schedule_id: Optional[int] = Field(default=None, foreign_key="maintenanceschedule.id", index=True)
+    occurrenceDate: Optional[date] = None
 
     car: Car = Relationship(back_populates="maintenance_requests")
 
     garage: Garage = Relationship(back_populates="maintenance_requests")
+
+
+class MaintenanceRequestArchive(SQLModel, table=True):
+    id: int = Field(primary_key=True)
+    car_id: int = Field(index=True)
+    garage_id: int = Field(index=True)
+    serviceType: str
+    scheduledDate: date = Field(index=True)
+    schedule_id: Optional[int] = Field(default=None, index=True)
+    occurrenceDate: Optional[date] = None
+
+
+class ArchiveState(SQLModel, table=True):
+    id: int = Field(default=None, primary_key=True)
+    archivedBefore: date
+
+
+class ReportDataVersion(SQLModel, table=True):
+    # A single row, bumped in the same transaction as every write that changes report results
+    id: int = Field(default=None, primary_key=True)
+    version: int = 0
+
+
+class ReportJob(SQLModel, table=True):
+    # Report jobs and their results live here, so any worker process can answer for them
+    id: str = Field(primary_key=True, max_length=32)
+    # Hash of the report type, garages, range and data version; identical jobs share it
+    cacheKey: str = Field(index=True, max_length=64)
+    reportType: str
+    garageIds: str
+    start: str
+    end: str
+    status: str
+    error: Optional[str] = Field(default=None, sa_column=Column(Text))
+    # JSON of the finished reports
+    result: Optional[str] = Field(default=None, sa_column=Column(Text(length=2 ** 24 - 1)))
+    # Unix timestamp in seconds
+    createdAt: float = Field(index=True)
+
+
+class IdempotencyKey(SQLModel, table=True):
+    key: str = Field(primary_key=True, max_length=255)
+    # Method, path and body hash of the first request sent with this key
+    fingerprint: str
+    # Null while the first request is still being handled
+    statusCode: Optional[int] = None
+    headers: Optional[str] = Field(default=None, sa_column=Column(Text))
+    body: Optional[bytes] = Field(default=None, sa_column=Column(LargeBinary(length=2 ** 24)))
+    # Unix timestamps in seconds
+    createdAt: float
+    expiresAt: float = Field(index=True)
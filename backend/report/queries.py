@@ -0,0 +1,134 @@
+import calendar
+
+from collections import defaultdict
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from typing import Dict, Iterable, List, Tuple
+from datetime import date, timedelta
+
+from backend.models import MaintenanceRequest, MaintenanceRequestArchive, Garage
+from backend.dtos import MonthlyRequestsReportDTO, DailyAvailabilityReportDTO, MonthName, YearMonth
+from backend.archive.archive import reaches_archive
+from backend.schedule.schedule import expand_schedules
+
+
+def count_requests_by_day(
+        db: Session,
+        garage_ids: Iterable[int],
+        start_date: date,
+        end_date: date,
+) -> Dict[Tuple[int, date], int]:
+    # One grouped query per table instead of one COUNT per garage and day, plus unconfirmed schedule occurrences
+    garage_ids = list(garage_ids)
+
+    sources = [MaintenanceRequest]
+    if reaches_archive(db, start_date):
+        sources.append(MaintenanceRequestArchive)
+
+    counts = defaultdict(int)
+    for source in sources:
+        rows = (
+            db.query(source.garage_id, source.scheduledDate, func.count(source.id))
+            .filter(
+                source.garage_id.in_(garage_ids),
+                source.scheduledDate >= start_date,
+                source.scheduledDate <= end_date,
+            )
+            .group_by(source.garage_id, source.scheduledDate)
+            .all()
+        )
+        for garage_id, scheduled_date, num_requests in rows:
+            counts[(garage_id, scheduled_date)] += num_requests
+
+    for schedule, occurrence in expand_schedules(db, start_date, end_date, garage_ids=garage_ids):
+        counts[(schedule.garage_id, occurrence)] += 1
+
+    return counts
+
+
+def count_requests_by_service_type(
+        db: Session,
+        garage_ids: Iterable[int],
+        start_date: date,
+        end_date: date,
+) -> Dict[Tuple[int, str], int]:
+    garage_ids = list(garage_ids)
+
+    sources = [MaintenanceRequest]
+    if reaches_archive(db, start_date):
+        sources.append(MaintenanceRequestArchive)
+
+    counts = defaultdict(int)
+    for source in sources:
+        rows = (
+            db.query(source.garage_id, source.serviceType, func.count(source.id))
+            .filter(
+                source.garage_id.in_(garage_ids),
+                source.scheduledDate >= start_date,
+                source.scheduledDate <= end_date,
+            )
+            .group_by(source.garage_id, source.serviceType)
+            .all()
+        )
+        for garage_id, service_type, num_requests in rows:
+            counts[(garage_id, service_type)] += num_requests
+
+    for schedule, _ in expand_schedules(db, start_date, end_date, garage_ids=garage_ids):
+        counts[(schedule.garage_id, schedule.serviceType)] += 1
+
+    return counts
+
+
+def month_starts(start_month: date, end_month: date) -> List[date]:
+    months = []
+    current = start_month.replace(day=1)
+    while current <= end_month:
+        months.append(current)
+        current = (current.replace(day=28) + timedelta(days=4)).replace(day=1)
+    return months
+
+
+def month_end(month_start: date) -> date:
+    return month_start.replace(day=calendar.monthrange(month_start.year, month_start.month)[1])
+
+
+def build_monthly_report(
+        counts: Dict[Tuple[int, date], int],
+        garage_id: int,
+        months: List[date],
+) -> List[MonthlyRequestsReportDTO]:
+    per_month = defaultdict(int)
+    for (counted_garage_id, scheduled_date), num_requests in counts.items():
+        if counted_garage_id == garage_id:
+            per_month[(scheduled_date.year, scheduled_date.month)] += num_requests
+
+    report = []
+    for month in months:
+        year_month = YearMonth(
+            year=month.year,
+            month=MonthName(month.strftime("%B").upper()),
+            leapYear=calendar.isleap(month.year),
+            monthValue=month.month
+        )
+        report.append(MonthlyRequestsReportDTO(
+            yearMonth=year_month,
+            requests=per_month[(month.year, month.month)]
+        ))
+    return report
+
+
+def build_daily_availability_report(
+        counts: Dict[Tuple[int, date], int],
+        garage: Garage,
+        start_date: date,
+        end_date: date,
+) -> List[DailyAvailabilityReportDTO]:
+    report = []
+    current_date = start_date
+    while current_date <= end_date:
+        report.append(DailyAvailabilityReportDTO(
+            date=current_date,
+            availableCapacity=garage.capacity - counts.get((garage.id, current_date), 0)
+        ))
+        current_date += timedelta(days=1)
+    return report
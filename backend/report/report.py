@@ -0,0 +1,237 @@
+import hashlib
+import json
+import time
+import uuid
+
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime
+from itertools import chain
+from typing import List
+
+from fastapi import APIRouter, HTTPException, Depends
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import event, insert, update
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+from backend.models import (
+    Garage,
+    MaintenanceRequest,
+    MaintenanceRequestArchive,
+    MaintenanceSchedule,
+    ReportDataVersion,
+    ReportJob,
+)
+from backend.dtos import (
+    CreateReportJobDTO,
+    ReportJobDTO,
+    ReportJobResultDTO,
+    ReportJobStatus,
+    ReportType,
+)
+from backend.database import get_db, engine
+from backend.report.queries import (
+    count_requests_by_day,
+    month_starts,
+    month_end,
+    build_monthly_report,
+    build_daily_availability_report,
+)
+
+# Report jobs only wait on the database, so threads are enough
+REPORT_WORKERS = 4
+# Jobs and their cached results are kept this long, whatever their status
+REPORT_JOB_TTL_SECONDS = 24 * 60 * 60
+
+# Writes to these models change report results
+REPORT_MODELS = (MaintenanceRequest, MaintenanceRequestArchive, MaintenanceSchedule, Garage)
+
+router = APIRouter()
+
+# Jobs run in the process that accepted them; their state and results are shared through the database
+executor = ThreadPoolExecutor(max_workers=REPORT_WORKERS, thread_name_prefix="report-job")
+
+
+@event.listens_for(Session, "after_flush")
+def _track_report_writes(session, flush_context):
+    if any(isinstance(obj, REPORT_MODELS) for obj in chain(session.new, session.dirty, session.deleted)):
+        session.info["report_data_changed"] = True
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _track_report_bulk_writes(orm_execute_state):
+    if orm_execute_state.is_update or orm_execute_state.is_delete:
+        if any(mapper.class_ in REPORT_MODELS for mapper in orm_execute_state.all_mappers):
+            orm_execute_state.session.info["report_data_changed"] = True
+
+
+@event.listens_for(Session, "before_commit")
+def _bump_on_commit(session):
+    # A session joined to an outer transaction (POST /batch) has only released a savepoint;
+    # the batch bumps once right before its outer commit, so the version row is not locked
+    # for the whole batch
+    if isinstance(session.bind, Connection) and session.bind.in_transaction():
+        return
+    bump_data_version(session)
+
+
+def bump_data_version(session: Session):
+    # The version lives in the database and is bumped in the same transaction as the write,
+    # so every worker process sees it change together with the data
+    session.flush()
+    if not session.info.pop("report_data_changed", False):
+        return
+    bumped = session.execute(
+        update(ReportDataVersion)
+        .where(ReportDataVersion.id == 1)
+        .values(version=ReportDataVersion.version + 1)
+        .execution_options(synchronize_session=False)
+    )
+    if bumped.rowcount == 0:
+        session.execute(insert(ReportDataVersion).values(id=1, version=1))
+
+
+def get_data_version(db: Session) -> int:
+    return db.query(ReportDataVersion.version).filter(ReportDataVersion.id == 1).scalar() or 0
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_report_writes(session):
+    session.info.pop("report_data_changed", None)
+
+
+def compute_reports(db: Session, report_type: ReportType, garage_ids: List[int], start: date, end: date):
+    if report_type == ReportType.MONTHLY_REQUESTS:
+        months = month_starts(start, end)
+        counts = count_requests_by_day(db, garage_ids, months[0], month_end(months[-1]))
+        return {garage_id: build_monthly_report(counts, garage_id, months) for garage_id in garage_ids}
+
+    garages = db.query(Garage).filter(Garage.id.in_(garage_ids)).all()
+    counts = count_requests_by_day(db, garage_ids, start, end)
+    return {garage.id: build_daily_availability_report(counts, garage, start, end) for garage in garages}
+
+
+def _run_job(job_id: str):
+    try:
+        with Session(engine) as db:
+            job = db.get(ReportJob, job_id)
+            job.status = ReportJobStatus.RUNNING.value
+            db.commit()
+
+            date_format = "%Y-%m" if job.reportType == ReportType.MONTHLY_REQUESTS else "%Y-%m-%d"
+            reports = compute_reports(
+                db,
+                ReportType(job.reportType),
+                [int(garage_id) for garage_id in job.garageIds.split(",")],
+                datetime.strptime(job.start, date_format).date(),
+                datetime.strptime(job.end, date_format).date(),
+            )
+            job.result = json.dumps(jsonable_encoder(reports))
+            job.status = ReportJobStatus.DONE.value
+            db.commit()
+    except Exception as e:
+        # Recorded in a fresh session, so a job never stays PENDING or RUNNING after its thread gave up
+        with Session(engine) as db:
+            db.query(ReportJob).filter(ReportJob.id == job_id).update(
+                {ReportJob.status: ReportJobStatus.FAILED.value, ReportJob.error: str(e)},
+                synchronize_session=False,
+            )
+            db.commit()
+
+
+def _to_dto(job: ReportJob, cached: bool = False) -> ReportJobDTO:
+    return ReportJobDTO(
+        id=job.id,
+        reportType=job.reportType,
+        garageIds=[int(garage_id) for garage_id in job.garageIds.split(",")],
+        start=job.start,
+        end=job.end,
+        status=job.status,
+        cached=cached,
+        error=job.error,
+    )
+
+
+def _get_job(db: Session, id: str) -> ReportJob:
+    job = db.query(ReportJob).filter(
+        ReportJob.id == id,
+        ReportJob.createdAt >= time.time() - REPORT_JOB_TTL_SECONDS,
+    ).first()
+    if not job:
+        raise HTTPException(status_code=404, detail="Report job not found")
+    return job
+
+
+# POST /reports/jobs
+@router.post("/reports/jobs", response_model=ReportJobDTO, status_code=202, tags=["Report Controller"])
+def submit_report_job(request: CreateReportJobDTO, db: Session = Depends(get_db)):
+    date_format = "%Y-%m" if request.reportType == ReportType.MONTHLY_REQUESTS else "%Y-%m-%d"
+    try:
+        start = datetime.strptime(request.start, date_format).date()
+        end = datetime.strptime(request.end, date_format).date()
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"Invalid date format, expected {date_format}")
+
+    if start > end:
+        raise HTTPException(status_code=400, detail="Start must not be after end")
+
+    garage_ids = tuple(sorted(set(request.garageIds)))
+    if not garage_ids:
+        raise HTTPException(status_code=400, detail="At least one garage is required")
+
+    found = {garage_id for (garage_id,) in db.query(Garage.id).filter(Garage.id.in_(garage_ids)).all()}
+    missing = [garage_id for garage_id in garage_ids if garage_id not in found]
+    if missing:
+        raise HTTPException(status_code=404, detail=f"Garages not found: {missing}")
+
+    now = time.time()
+    db.query(ReportJob).filter(ReportJob.createdAt < now - REPORT_JOB_TTL_SECONDS).delete()
+
+    key = json.dumps([request.reportType.value, garage_ids, start.isoformat(), end.isoformat(), get_data_version(db)])
+    cache_key = hashlib.sha256(key.encode()).hexdigest()
+
+    # An identical job for the same data is either still being computed or already has its result
+    existing = (
+        db.query(ReportJob)
+        .filter(ReportJob.cacheKey == cache_key, ReportJob.status != ReportJobStatus.FAILED.value)
+        .order_by(ReportJob.createdAt.desc())
+        .first()
+    )
+    if existing:
+        db.commit()
+        return _to_dto(existing, cached=existing.status == ReportJobStatus.DONE)
+
+    job = ReportJob(
+        id=uuid.uuid4().hex,
+        cacheKey=cache_key,
+        reportType=request.reportType.value,
+        garageIds=",".join(str(garage_id) for garage_id in garage_ids),
+        start=request.start,
+        end=request.end,
+        status=ReportJobStatus.PENDING.value,
+        createdAt=now,
+    )
+    db.add(job)
+    db.commit()
+
+    executor.submit(_run_job, job.id)
+
+    return _to_dto(job)
+
+
+# GET /reports/jobs/{id}
+@router.get("/reports/jobs/{id}", response_model=ReportJobDTO, tags=["Report Controller"])
+def get_report_job(id: str, db: Session = Depends(get_db)):
+    return _to_dto(_get_job(db, id))
+
+
+# GET /reports/jobs/{id}/result
+@router.get("/reports/jobs/{id}/result", response_model=ReportJobResultDTO, tags=["Report Controller"])
+def get_report_job_result(id: str, db: Session = Depends(get_db)):
+    job = _get_job(db, id)
+    if job.status == ReportJobStatus.FAILED:
+        raise HTTPException(status_code=500, detail=f"Report job failed: {job.error}")
+    if job.status != ReportJobStatus.DONE:
+        raise HTTPException(status_code=409, detail=f"Report job is {job.status}")
+
+    return ReportJobResultDTO(id=job.id, reportType=job.reportType, reports=json.loads(job.result))
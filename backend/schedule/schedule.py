@@ -0,0 +1,238 @@
+import calendar
+
+from fastapi import APIRouter, HTTPException, Depends
+from sqlalchemy import or_
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from typing import Iterable, Iterator, List, Optional, Tuple
+from datetime import date, timedelta
+
+from backend.models import (
+    MaintenanceSchedule,
+    MaintenanceRequest,
+    MaintenanceRequestArchive,
+    RecurrenceUnit,
+    Car,
+    Garage,
+)
+from backend.dtos import (
+    CreateMaintenanceScheduleDTO,
+    ResponseMaintenanceScheduleDTO,
+    ConfirmOccurrenceDTO,
+    ResponseMaintenanceDTO,
+)
+from backend.database import get_db
+
+# How far ahead (and back) open-ended listings expand schedules when no end (or start) date is given
+SCHEDULE_HORIZON_DAYS = 365
+
+# Longest window schedules are expanded over, so a far-off date cannot build an unbounded list;
+# stored maintenance requests are never limited by it
+MAX_EXPANSION_DAYS = 5 * 366
+
+router = APIRouter()
+
+
+def _add_months(start: date, months: int) -> date:
+    year, month = divmod(start.month - 1 + months, 12)
+    year += start.year
+    month += 1
+    return date(year, month, min(start.day, calendar.monthrange(year, month)[1]))
+
+
+def occurrence_dates(schedule: MaintenanceSchedule, start: date, end: date) -> Iterator[date]:
+    # Occurrences are always counted from startDate, so a clamped Jan 31 -> Feb 28 does not drift
+    first = max(start, schedule.startDate)
+    last = min(end, schedule.endDate) if schedule.endDate else end
+    if first > last:
+        return
+
+    if schedule.intervalUnit == RecurrenceUnit.MONTHS:
+        elapsed = (first.year - schedule.startDate.year) * 12 + first.month - schedule.startDate.month
+        n = max(0, elapsed // schedule.interval - 1)
+        occurrence = _add_months(schedule.startDate, n * schedule.interval)
+        while occurrence <= last:
+            if occurrence >= first:
+                yield occurrence
+            n += 1
+            occurrence = _add_months(schedule.startDate, n * schedule.interval)
+        return
+
+    step = schedule.interval * (7 if schedule.intervalUnit == RecurrenceUnit.WEEKS else 1)
+    n = -(-(first - schedule.startDate).days // step)
+    occurrence = schedule.startDate + timedelta(days=n * step)
+    while occurrence <= last:
+        yield occurrence
+        occurrence += timedelta(days=step)
+
+
+def expand_schedules(
+        db: Session,
+        start: date,
+        end: date,
+        car_id: Optional[int] = None,
+        garage_ids: Optional[Iterable[int]] = None,
+) -> List[Tuple[MaintenanceSchedule, date]]:
+    # Unconfirmed occurrences in [start, end]; confirmed ones already exist as maintenance requests
+    query = db.query(MaintenanceSchedule).filter(
+        MaintenanceSchedule.startDate <= end,
+        or_(MaintenanceSchedule.endDate.is_(None), MaintenanceSchedule.endDate >= start),
+    )
+    if car_id:
+        query = query.filter(MaintenanceSchedule.car_id == car_id)
+    if garage_ids is not None:
+        query = query.filter(MaintenanceSchedule.garage_id.in_(list(garage_ids)))
+
+    schedules = query.all()
+    if not schedules:
+        return []
+
+    # Only the part of the window the schedules cover is expanded, and at most MAX_EXPANSION_DAYS of it
+    start = max(start, min(schedule.startDate for schedule in schedules))
+    if all(schedule.endDate for schedule in schedules):
+        end = min(end, max(schedule.endDate for schedule in schedules))
+    end = min(end, start + timedelta(days=MAX_EXPANSION_DAYS - 1))
+
+    confirmed = set()
+    for source in (MaintenanceRequest, MaintenanceRequestArchive):
+        confirmed.update(
+            db.query(source.schedule_id, source.occurrenceDate)
+            .filter(
+                source.schedule_id.in_([schedule.id for schedule in schedules]),
+                source.occurrenceDate >= start,
+                source.occurrenceDate <= end,
+            )
+            .all()
+        )
+
+    return [
+        (schedule, occurrence)
+        for schedule in schedules
+        for occurrence in occurrence_dates(schedule, start, end)
+        if (schedule.id, occurrence) not in confirmed
+    ]
+
+
+def occurrence_to_dto(schedule: MaintenanceSchedule, occurrence: date) -> ResponseMaintenanceDTO:
+    return ResponseMaintenanceDTO(
+        id=None,
+        car_id=schedule.car_id,
+        carName=schedule.car.make,
+        serviceType=schedule.serviceType,
+        scheduledDate=occurrence,
+        garage_id=schedule.garage_id,
+        garageName=schedule.garage.name,
+        schedule_id=schedule.id,
+    )
+
+
+def _get_schedule(db: Session, id: int) -> MaintenanceSchedule:
+    schedule = db.get(MaintenanceSchedule, id)
+    if not schedule:
+        raise HTTPException(status_code=404, detail="Maintenance schedule not found")
+    return schedule
+
+
+# GET /schedules/{id}
+@router.get("/schedules/{id}", response_model=ResponseMaintenanceScheduleDTO, tags=["Schedule Controller"])
+def get_schedule_by_id(id: int, db: Session = Depends(get_db)):
+    return _get_schedule(db, id)
+
+
+# DELETE /schedules/{id}
+@router.delete("/schedules/{id}", response_model=dict, tags=["Schedule Controller"])
+def delete_schedule(id: int, db: Session = Depends(get_db)):
+    schedule = _get_schedule(db, id)
+
+    # Confirmed occurrences stay as ordinary maintenance requests
+    for source in (MaintenanceRequest, MaintenanceRequestArchive):
+        db.query(source).filter(source.schedule_id == id).update(
+            {source.schedule_id: None, source.occurrenceDate: None}, synchronize_session=False
+        )
+
+    db.delete(schedule)
+    db.commit()
+    return {"success": True}
+
+
+# GET /schedules
+@router.get("/schedules", response_model=List[ResponseMaintenanceScheduleDTO], tags=["Schedule Controller"])
+def get_schedules(carId: int = None, garageId: int = None, db: Session = Depends(get_db)):
+    query = db.query(MaintenanceSchedule)
+
+    if carId:
+        query = query.filter(MaintenanceSchedule.car_id == carId)
+
+    if garageId:
+        query = query.filter(MaintenanceSchedule.garage_id == garageId)
+
+    schedules = query.all()
+
+    if not schedules:
+        raise HTTPException(status_code=404, detail="No maintenance schedules found")
+
+    return schedules
+
+
+# POST /schedules
+@router.post("/schedules", response_model=ResponseMaintenanceScheduleDTO, tags=["Schedule Controller"])
+def create_schedule(new_schedule: CreateMaintenanceScheduleDTO, db: Session = Depends(get_db)):
+    if not db.get(Car, new_schedule.car_id):
+        raise HTTPException(status_code=404, detail="Car not found")
+
+    if not db.get(Garage, new_schedule.garage_id):
+        raise HTTPException(status_code=404, detail="Garage not found")
+
+    if new_schedule.interval < 1:
+        raise HTTPException(status_code=400, detail="Interval must be positive.")
+
+    if new_schedule.endDate and new_schedule.endDate < new_schedule.startDate:
+        raise HTTPException(status_code=400, detail="End date must not be before start date.")
+
+    db_record = MaintenanceSchedule(**new_schedule.dict())
+    db.add(db_record)
+    db.commit()
+    db.refresh(db_record)
+    return db_record
+
+
+# POST /schedules/{id}/confirm
+@router.post("/schedules/{id}/confirm", response_model=ResponseMaintenanceDTO, tags=["Schedule Controller"])
+def confirm_occurrence(id: int, confirmation: ConfirmOccurrenceDTO, db: Session = Depends(get_db)):
+    schedule = _get_schedule(db, id)
+    occurrence = confirmation.occurrenceDate
+
+    if occurrence not in occurrence_dates(schedule, occurrence, occurrence):
+        raise HTTPException(status_code=400, detail=f"{occurrence} is not an occurrence of this schedule")
+
+    for source in (MaintenanceRequest, MaintenanceRequestArchive):
+        if db.query(source).filter(source.schedule_id == id, source.occurrenceDate == occurrence).first():
+            raise HTTPException(status_code=409, detail="Occurrence is already confirmed")
+
+    maintenance_request = MaintenanceRequest(
+        car_id=schedule.car_id,
+        garage_id=schedule.garage_id,
+        serviceType=schedule.serviceType,
+        scheduledDate=occurrence,
+        schedule_id=schedule.id,
+        occurrenceDate=occurrence,
+    )
+    db.add(maintenance_request)
+    try:
+        db.commit()
+    except IntegrityError:
+        # Another request confirmed the same occurrence after our check
+        db.rollback()
+        raise HTTPException(status_code=409, detail="Occurrence is already confirmed")
+    db.refresh(maintenance_request)
+
+    return ResponseMaintenanceDTO(
+        id=maintenance_request.id,
+        car_id=maintenance_request.car_id,
+        carName=schedule.car.make,
+        serviceType=maintenance_request.serviceType,
+        scheduledDate=maintenance_request.scheduledDate,
+        garage_id=maintenance_request.garage_id,
+        garageName=schedule.garage.name,
+        schedule_id=schedule.id,
+    )